@@ -1,14 +1,53 @@
 # openpyxlのインストールが必要です: pip install openpyxl
+from __future__ import annotations
+
+import time
+_IMPORT_STARTED = time.perf_counter()
+
 from fastapi import FastAPI, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, StreamingResponse
-import pandas as pd
-import numpy as np
+import hashlib
+import importlib
+import json
 import os
 import random
 import io
+import threading
 from typing import Any, Dict, List
 
+# --- 高速起動モード ---
+# FAST_START=1 のとき、起動時のデータ読み込みを初回利用時まで遅延する（既定は無効）
+# pandasのインポートが初回リクエストに移るだけで初回データ要求は速くならないため、オプトインとしている
+FAST_START = os.environ.get('FAST_START', '0') == '1'
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(SCRIPT_DIR, 'data')
+SNAPSHOT_PATH = os.path.join(DATA_DIR, 'default_snapshot.json')
+DEFAULT_CSV_FILES = {'台': '台.csv', '棚': '棚.csv', '棚位置': '棚位置.csv', '商品': '商品.csv'}
+
+# インポート・起動・データ読み込みの所要時間（/api/startup_timing で参照）
+startup_timing: Dict[str, Any] = {'fast_start': FAST_START}
+
+class _LazyModule:
+    """初回の属性アクセス時にモジュールをインポートする（インポート時間も記録）"""
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def _ensure_imported(self):
+        if self._module is None:
+            start = time.perf_counter()
+            self._module = importlib.import_module(self._name)
+            startup_timing[f'{self._name}_import_ms'] = (time.perf_counter() - start) * 1000
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._ensure_imported(), attr)
+
+# pandas(とNumPy)はコールドスタートの大半を占めるため、実際に使うまでインポートしない
+pd = _LazyModule('pandas')
+
 # FastAPIアプリケーションを初期化
 app = FastAPI()
 
@@ -23,35 +62,129 @@ app.add_middleware(
 
 # --- グローバルデータフレーム ---
 # アプリケーション全体で共有されるデータ。アップロードやデモデータ読み込みで更新される。
-df_base = pd.DataFrame()
-df_shelf = pd.DataFrame()
-df_position = pd.DataFrame()
-df_master = pd.DataFrame()
+# 未読み込みの間は None（pandasのインポートを遅延するため）
+df_base = None
+df_shelf = None
+df_position = None
+df_master = None
 
 # 元の台設定を保存（フェイス数固定用）
 original_base_info = []
 
+# グローバルデータの更新を直列化する（既定データの遅延読み込みとアップロードの競合防止）
+_dataset_lock = threading.RLock()
+
 # --- データ管理関数 ---
-def set_global_dataframes(base, shelf, position, master):
+def _is_loaded(*frames) -> bool:
+    """全てのDataFrameが読み込み済みかつ空でないかを返す"""
+    return all(df is not None and not df.empty for df in frames)
+
+def _build_base_info(base) -> List[Dict[str, int]]:
+    """台データから台番号・フェイス数・段数のリストを作成する"""
+    tandan_counts = base['段数'] if '段数' in base.columns else [2] * len(base)
+    return [
+        {'台番号': int(daiban), 'フェイス数': int(faces), '段数': int(tandan)}
+        for daiban, faces, tandan in zip(base['台番号'], base['フェイス数'], tandan_counts)
+    ]
+
+def set_global_dataframes(base, shelf, position, master, base_info=None):
     """グローバルなDataFrameを更新する"""
     global df_base, df_shelf, df_position, df_master, original_base_info
-    df_base = base.copy()
-    df_shelf = shelf.copy()
-    df_position = position.copy()
-    df_master = master.copy()
-    
-    # 元の台情報を保存（フェイス数を固定するため）
-    original_base_info = []
-    for _, row in df_base.iterrows():
-        original_base_info.append({
-            '台番号': int(row['台番号']),
-            'フェイス数': int(row['フェイス数']),
-            '段数': int(row['段数']) if '段数' in row else 2
-        })
-    
+    with _dataset_lock:
+        df_base = base.copy()
+        df_shelf = shelf.copy()
+        df_position = position.copy()
+        df_master = master.copy()
+
+        # 元の台情報を保存（フェイス数を固定するため）
+        original_base_info = list(base_info) if base_info is not None else _build_base_info(df_base)
+
     print("グローバルDataFrameが更新されました。")
     print(f"元の台情報を保存: {original_base_info}")
 
+def _read_default_csvs() -> Dict[str, Any]:
+    return {name: pd.read_csv(os.path.join(DATA_DIR, filename)) for name, filename in DEFAULT_CSV_FILES.items()}
+
+def _default_source_hashes() -> Dict[str, str]:
+    """既定データセットの各CSVのSHA-256（スナップショットの鮮度確認用）"""
+    hashes = {}
+    for filename in DEFAULT_CSV_FILES.values():
+        with open(os.path.join(DATA_DIR, filename), 'rb') as f:
+            hashes[filename] = hashlib.sha256(f.read()).hexdigest()
+    return hashes
+
+# スナップショット形式のバージョン（形式を変えたら上げる）
+SNAPSHOT_FORMAT = 3
+
+def build_default_snapshot(path: str = SNAPSHOT_PATH) -> str:
+    """既定データセットのCSVを読み込み、高速起動用のスナップショットを書き出す"""
+    frames = _read_default_csvs()
+    # pandasのバージョンに依存しないよう、DataFrameではなく列ごとのリストとして保存する
+    snapshot = {
+        'format': SNAPSHOT_FORMAT,
+        'source_hashes': _default_source_hashes(),
+        'frames': {
+            name: {
+                'columns': list(df.columns),
+                # 欠損値は null で保存し、読み込み時に浮動小数点列として復元する
+                'float_columns': [col for col in df.columns if df[col].dtype.kind == 'f'],
+                'data': df.astype(object).where(df.notna(), None).to_dict('list')
+            }
+            for name, df in frames.items()
+        },
+        'base_info': _build_base_info(frames['台'])
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(snapshot, f, ensure_ascii=False, indent=1, allow_nan=False)
+        f.write('\n')
+    return path
+
+def _load_default_snapshot():
+    """スナップショットを読み込む。形式違い・CSVと内容不一致・読み込み失敗時は None"""
+    if not os.path.exists(SNAPSHOT_PATH):
+        return None
+    try:
+        with open(SNAPSHOT_PATH, encoding='utf-8') as f:
+            snapshot = json.load(f)
+        if snapshot.get('format') != SNAPSHOT_FORMAT or snapshot.get('source_hashes') != _default_source_hashes():
+            print("スナップショットがCSVと一致しないため使用しません。")
+            return None
+        frames = {}
+        for name, frame in snapshot['frames'].items():
+            df = pd.DataFrame(frame['data'], columns=frame['columns'])
+            for col in frame['float_columns']:
+                df[col] = df[col].astype('float64')
+            frames[name] = df
+        return {'frames': frames, 'base_info': snapshot['base_info']}
+    except Exception as e:
+        print(f"スナップショットの読み込みに失敗: {e}")
+        return None
+
+def load_default_dataset() -> str:
+    """既定データセットを読み込む（スナップショットを優先し、使えなければCSVから）"""
+    # 初回のpandasインポートは pandas_import_ms として別に記録されるため、計測から除く
+    pd._ensure_imported()
+    with _dataset_lock:
+        start = time.perf_counter()
+        snapshot = _load_default_snapshot()
+        if snapshot is not None:
+            frames, base_info, source = snapshot['frames'], snapshot['base_info'], 'snapshot'
+        else:
+            frames, base_info, source = _read_default_csvs(), None, 'csv'
+        set_global_dataframes(frames['台'], frames['棚'], frames['棚位置'], frames['商品'], base_info=base_info)
+        startup_timing['dataset_source'] = source
+        startup_timing['dataset_load_ms'] = (time.perf_counter() - start) * 1000
+    return source
+
+def _ensure_default_dataset(*names: str) -> None:
+    """指定したグローバルDataFrameが未読み込みなら既定データセットを読み込む"""
+    # 並行した初回リクエストやアップロードと競合しないよう、ロック内で再確認してから読み込む
+    with _dataset_lock:
+        if _is_loaded(*(globals()[name] for name in names)):
+            return
+        source = load_default_dataset()
+    print(f"既定データの読み込み完了（{source}）。")
+
 def convert_to_json_serializable(data):
     """DataFrameのint64型などをJSON対応の型に変換する"""
     if isinstance(data, pd.DataFrame):
@@ -66,28 +199,75 @@ def convert_to_json_serializable(data):
 
 @app.on_event("startup")
 async def startup_event():
-    """起動時にCSVからデータを読み込む（フォールバック）"""
-    try:
-        SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
-        DATA_DIR = os.path.join(SCRIPT_DIR, 'data')
-        
-        base_df = pd.read_csv(os.path.join(DATA_DIR, '台.csv'))
-        shelf_df = pd.read_csv(os.path.join(DATA_DIR, '棚.csv'))
-        position_df = pd.read_csv(os.path.join(DATA_DIR, '棚位置.csv'))
-        master_df = pd.read_csv(os.path.join(DATA_DIR, '商品.csv'))
-        
-        set_global_dataframes(base_df, shelf_df, position_df, master_df)
-        print("CSVデータから初期読み込み完了。")
-    except Exception as e:
-        print(f"CSVデータの初期読み込みに失敗: {e}。API経由でのデータ設定が必要です。")
-
-# --- 計算・最適化ロジック（変更なし）---
-def calculate_layout_score(df_pos, df_master, df_base):
+    """起動時に既定データを読み込む（高速起動モードでは初回利用時まで遅延）"""
+    start = time.perf_counter()
+    if FAST_START:
+        print("高速起動モード: データの読み込みを初回利用時まで遅延します。")
+    else:
+        try:
+            source = load_default_dataset()
+            print(f"既定データの初期読み込み完了（{source}）。")
+        except Exception as e:
+            print(f"CSVデータの初期読み込みに失敗: {e}。API経由でのデータ設定が必要です。")
+    startup_timing['startup_ms'] = (time.perf_counter() - start) * 1000
+    print(f"起動時間: インポート {startup_timing['import_ms']:.1f}ms / 起動処理 {startup_timing['startup_ms']:.1f}ms")
+
+# --- 棚段キャパシティインデックス ---
+# (台番号, 棚段番号) -> {'capacity': 台のフェイス数 (台情報がない場合は None), 'occupied': 使用中のフェース数}
+def build_shelf_capacity_index(df_pos: pd.DataFrame, df_base: pd.DataFrame) -> Dict[tuple, Dict[str, Any]]:
+    """棚段ごとの容量と使用フェース数のインデックスを作成する"""
+    capacity_by_dai: Dict[int, int] = {}
+    if not df_base.empty and '台番号' in df_base.columns and 'フェイス数' in df_base.columns:
+        for daiban, faces in zip(df_base['台番号'], df_base['フェイス数']):
+            # 同じ台番号が複数ある場合は最初の行を採用
+            capacity_by_dai.setdefault(int(daiban), int(faces))
+
+    index: Dict[tuple, Dict[str, Any]] = {}
+    if df_pos.empty:
+        return index
+    occupied = df_pos.groupby(['台番号', '棚段番号'])['フェース数'].sum()
+    for (daiban, tandan), faces in occupied.items():
+        index[(int(daiban), int(tandan))] = {
+            'capacity': capacity_by_dai.get(int(daiban)),
+            'occupied': int(faces)
+        }
+    return index
+
+def _swap_fits_capacity(index, key1, key2, faces1, faces2) -> bool:
+    """フェース数をスワップした後も棚段の容量を超えないかをO(1)で判定する"""
+    if key1 == key2 or faces1 == faces2:
+        return True
+    for key, delta in ((key1, faces2 - faces1), (key2, faces1 - faces2)):
+        entry = index.get(key)
+        if entry is None or entry['capacity'] is None or delta <= 0:
+            continue
+        # 既に容量超過している棚段は、超過を悪化させる移動のみ拒否する
+        if entry['occupied'] + delta > max(entry['capacity'], entry['occupied']):
+            return False
+    return True
+
+def _swapped_capacity_index(index, key1, key2, faces1, faces2):
+    """スワップ後のインデックスを返す（変更のある棚段のみ差し替え）"""
+    if key1 == key2 or faces1 == faces2:
+        return index
+    new_index = dict(index)
+    for key, delta in ((key1, faces2 - faces1), (key2, faces1 - faces2)):
+        entry = index.get(key)
+        if entry is None:
+            continue
+        new_index[key] = {'capacity': entry['capacity'], 'occupied': entry['occupied'] + delta}
+    return new_index
+
+# --- 計算・最適化ロジック ---
+def calculate_layout_score(df_pos, df_master, df_base, capacity_index=None):
     try:
         score = 0
-        if df_pos.empty or df_master.empty or df_base.empty: 
+        if df_pos.empty or df_master.empty or df_base.empty:
             return 0
-            
+
+        if capacity_index is None:
+            capacity_index = build_shelf_capacity_index(df_pos, df_base)
+
         df_merged = pd.merge(df_pos, df_master, on='商品コード', how='left')
         
         if df_merged.empty:
@@ -164,24 +344,22 @@ def calculate_layout_score(df_pos, df_master, df_base):
                 else:
                     # 属性が切り替わる場合はペナルティ
                     score -= 2  # ペナルティを強化
-            
-            dai_base_info = df_base[df_base['台番号'] == daiban]
-            if dai_base_info.empty: continue
-                
-            dai_max_width = dai_base_info['フェイス数'].iloc[0]
-            current_faces = sorted_group['フェース数'].sum()
-            empty_width = dai_max_width - current_faces
+
+        # 空きスペースのペナルティ（キャパシティインデックスから直接算出）
+        for entry in capacity_index.values():
+            if entry['capacity'] is None: continue
+            empty_width = entry['capacity'] - entry['occupied']
             # 空きスペースのペナルティを大幅に緩和（移動促進のため）
             if empty_width > 8:
                 score -= (empty_width - 8) * 2
-        
+
         # 縦方向スコアリング（強化版）
         try:
+            capacity_by_dai = {daiban: entry['capacity'] for (daiban, _), entry in capacity_index.items()}
             for daiban_id, dai_group in df_merged.groupby('台番号'):
-                dai_base_local = df_base[df_base['台番号'] == daiban_id]
                 max_width = 0
-                if not dai_base_local.empty:
-                    max_width = int(dai_base_local['フェイス数'].iloc[0])
+                if capacity_by_dai.get(int(daiban_id)) is not None:
+                    max_width = int(capacity_by_dai[int(daiban_id)])
                 else:
                     width_candidates = dai_group.groupby('棚段番号')['フェース数'].sum().astype(int)
                     if not width_candidates.empty:
@@ -249,22 +427,34 @@ def _compact_and_update_df(df_to_update: pd.DataFrame):
 
 def optimize_greedy(df_pos: pd.DataFrame, df_master_local: pd.DataFrame, df_base_local: pd.DataFrame, max_passes: int = 15) -> tuple[pd.DataFrame, float]:
     current_df = df_pos.copy()
-    
-    current_score = calculate_layout_score(current_df, df_master_local, df_base_local)
+
+    # 棚段ごとの容量・使用量インデックス（スワップ採用時に差分更新する）
+    capacity_index = build_shelf_capacity_index(current_df, df_base_local)
+    current_score = calculate_layout_score(current_df, df_master_local, df_base_local, capacity_index)
     no_improvement_count = 0  # 改善がない回数をカウント
+    rejected_count = 0  # 容量超過で棄却した候補数
 
     for pass_num in range(max_passes):
         best_score_in_pass = current_score
         best_df_in_pass = None
-        
+        best_index_in_pass = None
+
         item_indices = list(current_df.index)
         for i in range(len(item_indices)):
             for j in range(i + 1, len(item_indices)):
                 idx1, idx2 = item_indices[i], item_indices[j]
                 row1, row2 = current_df.loc[idx1], current_df.loc[idx2]
-                
+
+                # スコア計算の前に、容量を超えるスワップを棄却する
+                key1 = (int(row1['台番号']), int(row1['棚段番号']))
+                key2 = (int(row2['台番号']), int(row2['棚段番号']))
+                faces1, faces2 = int(row1['フェース数']), int(row2['フェース数'])
+                if not _swap_fits_capacity(capacity_index, key1, key2, faces1, faces2):
+                    rejected_count += 1
+                    continue
+
                 temp_df = current_df.copy()
-                
+
                 # より柔軟なスワップ条件 - 台を超えた移動も許可
                 is_swap_possible = False
                 
@@ -310,13 +500,15 @@ def optimize_greedy(df_pos: pd.DataFrame, df_master_local: pd.DataFrame, df_base
                     continue
                 
                 temp_df = _compact_and_update_df(temp_df)
-                new_score = calculate_layout_score(temp_df, df_master_local, df_base_local)
+                temp_index = _swapped_capacity_index(capacity_index, key1, key2, faces1, faces2)
+                new_score = calculate_layout_score(temp_df, df_master_local, df_base_local, temp_index)
 
                 if new_score > best_score_in_pass:
                     best_score_in_pass = new_score
                     best_df_in_pass = temp_df
+                    best_index_in_pass = temp_index
 
-        if best_df_in_pass is None: 
+        if best_df_in_pass is None:
             no_improvement_count += 1
             if no_improvement_count >= 2:  # 2回連続改善なしで早期終了
                 print(f"早期終了: パス {pass_num + 1} で改善が見られませんでした")
@@ -325,8 +517,11 @@ def optimize_greedy(df_pos: pd.DataFrame, df_master_local: pd.DataFrame, df_base
             no_improvement_count = 0  # 改善があったらカウントリセット
             current_df = best_df_in_pass
             current_score = best_score_in_pass
+            capacity_index = best_index_in_pass
             print(f"パス {pass_num + 1}: スコア {current_score:.1f}")
 
+    if rejected_count:
+        print(f"容量超過により棄却したスワップ候補: {rejected_count}件")
     return current_df, current_score
 
 def calculate_dynamic_base_info(df_position):
@@ -376,24 +571,15 @@ def get_initial_data_endpoint():
     """現在のマスターデータから初期レイアウトを生成して返す"""
     global df_base, df_shelf, df_position, df_master
     
-    # データが空の場合、CSVファイルから直接読み込み
-    if df_position.empty or df_master.empty:
+    # データが未読み込みの場合、既定データセットを読み込み
+    if not _is_loaded(df_position, df_master):
         try:
-            SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
-            DATA_DIR = os.path.join(SCRIPT_DIR, 'data')
-            
-            base_df = pd.read_csv(os.path.join(DATA_DIR, '台.csv'))
-            shelf_df = pd.read_csv(os.path.join(DATA_DIR, '棚.csv'))
-            position_df = pd.read_csv(os.path.join(DATA_DIR, '棚位置.csv'))
-            master_df = pd.read_csv(os.path.join(DATA_DIR, '商品.csv'))
-            
-            set_global_dataframes(base_df, shelf_df, position_df, master_df)
-            print("CSV データから読み込み完了。")
+            _ensure_default_dataset('df_position', 'df_master')
         except Exception as e:
             print(f"CSV データの読み込みエラー: {e}")
             return JSONResponse({"error": f"データファイルの読み込みに失敗しました: {str(e)}"}, status_code=500)
     
-    if df_position.empty or df_master.empty:
+    if not _is_loaded(df_position, df_master):
          return JSONResponse({"error": "データが読み込まれていません。"}, status_code=404)
 
     df_pos_with_faces = df_position.copy()
@@ -419,24 +605,15 @@ def get_demo_data_endpoint():
     """デモデータを生成しグローバル変数を更新後、そのデータを返す"""
     global df_base, df_shelf, df_position, df_master
     
-    # データが空の場合、CSVファイルから直接読み込み
-    if df_master.empty or df_position.empty:
+    # データが未読み込みの場合、既定データセットを読み込み
+    if not _is_loaded(df_master, df_position):
         try:
-            SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
-            DATA_DIR = os.path.join(SCRIPT_DIR, 'data')
-            
-            base_df = pd.read_csv(os.path.join(DATA_DIR, '台.csv'))
-            shelf_df = pd.read_csv(os.path.join(DATA_DIR, '棚.csv'))
-            position_df = pd.read_csv(os.path.join(DATA_DIR, '棚位置.csv'))
-            master_df = pd.read_csv(os.path.join(DATA_DIR, '商品.csv'))
-            
-            set_global_dataframes(base_df, shelf_df, position_df, master_df)
-            print("CSV データから読み込み完了。")
+            _ensure_default_dataset('df_master', 'df_position')
         except Exception as e:
             print(f"CSV データの読み込みエラー: {e}")
             return JSONResponse({"error": f"データファイルの読み込みに失敗しました: {str(e)}"}, status_code=500)
     
-    if df_master.empty or df_position.empty:
+    if not _is_loaded(df_master, df_position):
         return JSONResponse({"error": "マスターデータまたは棚位置の初期読み込みに失敗"}, status_code=500)
 
     try:
@@ -501,24 +678,15 @@ def get_demo_data_endpoint():
 async def optimize(request: dict):
     global df_base, df_shelf, df_position, df_master
     
-    # データが空の場合、CSVファイルから直接読み込み
-    if df_master.empty:
+    # データが未読み込みの場合、既定データセットを読み込み
+    if not _is_loaded(df_master):
         try:
-            SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
-            DATA_DIR = os.path.join(SCRIPT_DIR, 'data')
-            
-            base_df = pd.read_csv(os.path.join(DATA_DIR, '台.csv'))
-            shelf_df = pd.read_csv(os.path.join(DATA_DIR, '棚.csv'))
-            position_df = pd.read_csv(os.path.join(DATA_DIR, '棚位置.csv'))
-            master_df = pd.read_csv(os.path.join(DATA_DIR, '商品.csv'))
-            
-            set_global_dataframes(base_df, shelf_df, position_df, master_df)
-            print("CSV データから読み込み完了。")
+            _ensure_default_dataset('df_master')
         except Exception as e:
             print(f"CSV データの読み込みエラー: {e}")
             return JSONResponse({"error": f"データファイルの読み込みに失敗しました: {str(e)}"}, status_code=500)
     
-    if df_master.empty:
+    if not _is_loaded(df_master):
         return JSONResponse({"error": "マスターデータが読み込まれていません。"}, status_code=404)
     
     try:
@@ -551,24 +719,15 @@ async def optimize(request: dict):
 async def get_layout_data(request: dict):
     global df_base, df_shelf, df_position, df_master
     
-    # データが空の場合、CSVファイルから直接読み込み
-    if df_master.empty:
+    # データが未読み込みの場合、既定データセットを読み込み
+    if not _is_loaded(df_master):
         try:
-            SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
-            DATA_DIR = os.path.join(SCRIPT_DIR, 'data')
-            
-            base_df = pd.read_csv(os.path.join(DATA_DIR, '台.csv'))
-            shelf_df = pd.read_csv(os.path.join(DATA_DIR, '棚.csv'))
-            position_df = pd.read_csv(os.path.join(DATA_DIR, '棚位置.csv'))
-            master_df = pd.read_csv(os.path.join(DATA_DIR, '商品.csv'))
-            
-            set_global_dataframes(base_df, shelf_df, position_df, master_df)
-            print("CSV データから読み込み完了。")
+            _ensure_default_dataset('df_master')
         except Exception as e:
             print(f"CSV データの読み込みエラー: {e}")
             return JSONResponse({"error": f"データファイルの読み込みに失敗しました: {str(e)}"}, status_code=500)
     
-    if df_master.empty:
+    if not _is_loaded(df_master):
         return JSONResponse({"error": "マスターデータが読み込まれていません。"}, status_code=404)
     
     try:
@@ -619,7 +778,14 @@ async def get_layout_data(request: dict):
 @app.get("/api/download_excel")
 async def download_excel():
     """最適化後のデータをExcelファイルとしてダウンロードする"""
-    if df_position.empty or df_master.empty or df_base.empty:
+    # データが未読み込みの場合、既定データセットを読み込み
+    if not _is_loaded(df_position, df_master, df_base):
+        try:
+            _ensure_default_dataset('df_position', 'df_master', 'df_base')
+        except Exception as e:
+            print(f"CSV データの読み込みエラー: {e}")
+
+    if not _is_loaded(df_position, df_master, df_base):
         return JSONResponse({"error": "ダウンロードするデータがありません。"}, status_code=404)
     
     try:
@@ -685,11 +851,11 @@ def get_fixed_base_info():
         return original_base_info
     else:
         # フォールバック：現在のdf_baseから生成
-        base_info = []
-        for _, row in df_base.iterrows():
-            base_info.append({
-                '台番号': int(row['台番号']),
-                'フェイス数': int(row['フェイス数']),
-                '段数': int(row['段数']) if '段数' in row else 2
-            })
-        return base_info
+        return _build_base_info(df_base) if _is_loaded(df_base) else []
+
+@app.get("/api/startup_timing")
+def get_startup_timing():
+    """インポート・起動・データ読み込みの所要時間を返す"""
+    return JSONResponse(startup_timing)
+
+startup_timing['import_ms'] = (time.perf_counter() - _IMPORT_STARTED) * 1000
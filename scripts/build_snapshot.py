@@ -0,0 +1,21 @@
+"""
+既定データセットの起動用スナップショットを生成するスクリプト
+
+api/data の CSV を読み込み、api/data/default_snapshot.json に書き出す。
+CSV を更新した場合は再生成すること。読み込み時は各CSVのSHA-256で鮮度を確認し、
+内容が異なるスナップショットは無視して CSV から読み込む。
+
+使用例:
+    python scripts/build_snapshot.py
+"""
+import os
+import sys
+
+# プロジェクトのルートディレクトリをPythonパスに追加
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.index import build_default_snapshot
+
+
+if __name__ == '__main__':
+    print(f"スナップショットを出力: {build_default_snapshot()}")
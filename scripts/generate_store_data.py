@@ -0,0 +1,188 @@
+"""
+大規模店舗の合成データ生成スクリプト
+
+api/data と同じ形式（台・棚・商品・棚位置）のデータを任意のサイズで生成し、
+CSV / XLSX / JSON のいずれか（または全て）で出力する。
+
+使用例:
+    python scripts/generate_store_data.py --dai 20 --tandan 5 --faces 24 \
+        --attributes お茶=0.6,コーヒー=0.4 --master-size 500 --format all --out out/large_store
+"""
+import argparse
+import io
+import json
+import os
+import random
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+# api/data/*.csv と同じカラム構成
+BASE_COLUMNS = ['台番号', '台高さ', '台幅', '台奥行', '段数', 'フェイス数']
+SHELF_COLUMNS = ['台番号', '棚段番号', '棚高さ', '棚幅', '棚奥行', '棚厚さ']
+MASTER_COLUMNS = ['商品コード', '飲料属性']
+POSITION_COLUMNS = ['台番号', '棚段番号', '棚位置', '商品コード', 'フェース数', '在庫数量', '奥行陳列数']
+
+# アップロードAPIが要求するシート名（CSVのファイル名も同じ）
+SHEET_NAMES = ['台', '棚', '商品', '棚位置']
+
+DEFAULT_ATTRIBUTES = {'お茶': 0.5, 'コーヒー': 0.5}
+
+
+def parse_attribute_mix(text: str) -> Dict[str, float]:
+    """「お茶=0.6,コーヒー=0.4」形式の文字列を属性ごとの比率に変換する"""
+    mix: Dict[str, float] = {}
+    for part in text.split(','):
+        if not part.strip():
+            continue
+        name, _, weight = part.partition('=')
+        mix[name.strip()] = float(weight) if weight else 1.0
+    if not mix or sum(mix.values()) <= 0:
+        raise ValueError(f"属性比率が不正です: {text}")
+    return mix
+
+
+def generate_store(num_dai: int = 2, num_tandan: int = 3, faces: int = 17,
+                   attributes: Optional[Dict[str, float]] = None, master_size: int = 50,
+                   min_item_faces: int = 2, max_item_faces: int = 4,
+                   fill_ratio: float = 0.9, seed: int = 0) -> Dict[str, pd.DataFrame]:
+    """
+    合成店舗データを生成する
+
+    Returns:
+        {'台': df_base, '棚': df_shelf, '商品': df_master, '棚位置': df_position}
+    """
+    if num_dai < 1 or num_tandan < 1 or faces < 1 or master_size < 1:
+        raise ValueError("台数・段数・フェイス数・マスター件数は1以上を指定してください。")
+    if not 1 <= min_item_faces <= max_item_faces:
+        raise ValueError("フェース数の範囲が不正です。")
+
+    rng = random.Random(seed)
+    attributes = attributes or DEFAULT_ATTRIBUTES
+
+    # 商品マスター：属性比率に従って割り当て、JANコード風の13桁コードを振る
+    attr_names = list(attributes.keys())
+    attr_weights = [attributes[name] for name in attr_names]
+    codes = rng.sample(range(4900000000000, 4999999999999), master_size)
+    master_rows = [
+        {'商品コード': code, '飲料属性': rng.choices(attr_names, weights=attr_weights)[0]}
+        for code in codes
+    ]
+
+    base_rows: List[Dict[str, Any]] = []
+    shelf_rows: List[Dict[str, Any]] = []
+    position_rows: List[Dict[str, Any]] = []
+    for daiban in range(1, num_dai + 1):
+        base_rows.append({
+            '台番号': daiban, '台高さ': 1200, '台幅': faces * 55, '台奥行': 730,
+            '段数': num_tandan, 'フェイス数': faces
+        })
+        for tandan in range(1, num_tandan + 1):
+            shelf_rows.append({
+                '台番号': daiban, '棚段番号': tandan,
+                '棚高さ': 150 + (tandan - 1) * 390, '棚幅': faces * 55,
+                '棚奥行': 730 if tandan == 1 else 430, '棚厚さ': 5 if tandan == 1 else 20
+            })
+
+            # 容量 × 充填率を超えない範囲で商品を左から詰める
+            target_width = max(1, int(faces * fill_ratio))
+            used = 0
+            pos = 1
+            while used < target_width:
+                item_faces = rng.randint(min_item_faces, max_item_faces)
+                if used + item_faces > faces:
+                    item_faces = faces - used
+                    if item_faces < 1:
+                        break
+                item = rng.choice(master_rows)
+                stock = item_faces * rng.randint(3, 8)
+                position_rows.append({
+                    '台番号': daiban, '棚段番号': tandan, '棚位置': pos,
+                    '商品コード': item['商品コード'], 'フェース数': item_faces,
+                    '在庫数量': stock, '奥行陳列数': ''
+                })
+                used += item_faces
+                pos += 1
+
+    return {
+        '台': pd.DataFrame(base_rows, columns=BASE_COLUMNS),
+        '棚': pd.DataFrame(shelf_rows, columns=SHELF_COLUMNS),
+        '商品': pd.DataFrame(master_rows, columns=MASTER_COLUMNS),
+        '棚位置': pd.DataFrame(position_rows, columns=POSITION_COLUMNS),
+    }
+
+
+def to_xlsx_bytes(store: Dict[str, pd.DataFrame]) -> bytes:
+    """/api/upload にそのまま送れるXLSXバイト列を生成する"""
+    output = io.BytesIO()
+    with pd.ExcelWriter(output, engine='openpyxl') as writer:
+        for sheet_name in SHEET_NAMES:
+            store[sheet_name].to_excel(writer, sheet_name=sheet_name, index=False)
+    return output.getvalue()
+
+
+def to_json_dict(store: Dict[str, pd.DataFrame]) -> Dict[str, List[Dict[str, Any]]]:
+    """シート名をキーとしたJSON対応の辞書を生成する（'棚位置' は /api/optimize の position に使える）"""
+    return {name: df.to_dict('records') for name, df in store.items()}
+
+
+def write_store(store: Dict[str, pd.DataFrame], out_path: str, fmt: str = 'all') -> List[str]:
+    """
+    生成データを書き出す
+
+    csv: out_path ディレクトリに 台.csv などを出力
+    xlsx: out_path.xlsx に4シートを出力
+    json: out_path.json に出力
+    """
+    written = []
+    if fmt in ('csv', 'all'):
+        os.makedirs(out_path, exist_ok=True)
+        for sheet_name in SHEET_NAMES:
+            path = os.path.join(out_path, f'{sheet_name}.csv')
+            store[sheet_name].to_csv(path, index=False)
+            written.append(path)
+    if fmt in ('xlsx', 'all'):
+        path = f'{out_path}.xlsx'
+        with open(path, 'wb') as f:
+            f.write(to_xlsx_bytes(store))
+        written.append(path)
+    if fmt in ('json', 'all'):
+        path = f'{out_path}.json'
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(to_json_dict(store), f, ensure_ascii=False)
+        written.append(path)
+    return written
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description='大規模店舗の合成データを生成する')
+    parser.add_argument('--dai', type=int, default=2, help='台の数')
+    parser.add_argument('--tandan', type=int, default=3, help='台ごとの段数')
+    parser.add_argument('--faces', type=int, default=17, help='台のフェイス数（段ごとの容量）')
+    parser.add_argument('--attributes', type=parse_attribute_mix, default=DEFAULT_ATTRIBUTES,
+                        help='属性比率 例: お茶=0.6,コーヒー=0.4')
+    parser.add_argument('--master-size', type=int, default=50, help='商品マスターの件数')
+    parser.add_argument('--min-item-faces', type=int, default=2, help='1商品あたりの最小フェース数')
+    parser.add_argument('--max-item-faces', type=int, default=4, help='1商品あたりの最大フェース数')
+    parser.add_argument('--fill', type=float, default=0.9, help='段の充填率 (0-1)')
+    parser.add_argument('--seed', type=int, default=0, help='乱数シード')
+    parser.add_argument('--format', choices=['csv', 'xlsx', 'json', 'all'], default='all', help='出力形式')
+    parser.add_argument('--out', default='generated_store', help='出力先（拡張子なし）')
+    return parser
+
+
+def main():
+    args = build_arg_parser().parse_args()
+    store = generate_store(
+        num_dai=args.dai, num_tandan=args.tandan, faces=args.faces,
+        attributes=args.attributes, master_size=args.master_size,
+        min_item_faces=args.min_item_faces, max_item_faces=args.max_item_faces,
+        fill_ratio=args.fill, seed=args.seed
+    )
+    for path in write_store(store, args.out, args.format):
+        print(f"出力: {path}")
+    print(f"台 {len(store['台'])} / 棚 {len(store['棚'])} / 商品 {len(store['商品'])} / 棚位置 {len(store['棚位置'])}")
+
+
+if __name__ == '__main__':
+    main()
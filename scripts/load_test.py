@@ -0,0 +1,394 @@
+"""
+HTTP API のローカル負荷試験ハーネス
+
+uvicorn でAPIを起動し（--url 指定時は既存サーバーを使用）、
+/api/upload, /api/initial_data, /api/optimize, /api/layout_data, /api/download_excel
+を並行に呼び出して、エンドポイント別の p50/p99 レイテンシ・スループット・メモリ使用量を報告する。
+
+並行して軽量な /openapi.json をプローブし、そのレイテンシから
+イベントループのブロッキング（async エンドポイント内の同期処理）を検出する。
+
+使用例:
+    python scripts/load_test.py --concurrency 8 --duration 30 --dai 10 --tandan 4 --faces 24
+    python scripts/load_test.py --url http://localhost:8000 --mix initial_data=4,layout_data=4,optimize=1
+"""
+import argparse
+import json
+import math
+import os
+import random
+import resource
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from generate_store_data import generate_store, parse_attribute_mix, to_json_dict, to_xlsx_bytes
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENDPOINTS = ['upload', 'initial_data', 'optimize', 'layout_data', 'download_excel']
+DEFAULT_MIX = {'upload': 1, 'initial_data': 4, 'optimize': 1, 'layout_data': 4, 'download_excel': 2}
+PROBE_PATH = '/openapi.json'
+
+
+# --- HTTPヘルパー ---
+def http_request(base_url: str, method: str, path: str, body: Optional[bytes] = None,
+                 headers: Optional[Dict[str, str]] = None, timeout: float = 600) -> Tuple[int, bytes]:
+    req = urllib.request.Request(base_url + path, data=body, method=method, headers=headers or {})
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as res:
+            return res.status, res.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.read()
+
+
+def _multipart_body(field: str, filename: str, content: bytes, content_type: str) -> Tuple[bytes, str]:
+    boundary = uuid.uuid4().hex
+    body = (
+        f'--{boundary}\r\n'
+        f'Content-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+        f'Content-Type: {content_type}\r\n\r\n'
+    ).encode('utf-8') + content + f'\r\n--{boundary}--\r\n'.encode('utf-8')
+    return body, f'multipart/form-data; boundary={boundary}'
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """最近傍順位法によるパーセンタイル"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+# --- メモリ計測 ---
+def read_rss_mb(pid: int) -> Optional[float]:
+    """/proc からプロセスのRSS(MB)を読む（Linux以外では None）"""
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        return None
+    return None
+
+
+def _child_pids(pid: int) -> List[int]:
+    children: List[int] = []
+    try:
+        for task in os.listdir(f'/proc/{pid}/task'):
+            with open(f'/proc/{pid}/task/{task}/children') as f:
+                children.extend(int(child) for child in f.read().split())
+    except OSError:
+        pass
+    return children
+
+
+def read_tree_rss_mb(pid: int) -> Optional[float]:
+    """プロセスとその子孫（uvicornの複数ワーカー）のRSS合計(MB)を読む（Linux以外では None）"""
+    total = read_rss_mb(pid)
+    if total is None:
+        return None
+    pending = _child_pids(pid)
+    while pending:
+        child = pending.pop()
+        rss = read_rss_mb(child)
+        if rss is not None:
+            total += rss
+            pending.extend(_child_pids(child))
+    return total
+
+
+def client_peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS はバイト、Linux はKB単位
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+# --- サーバー起動 ---
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_server(port: int, workers: int, env: Optional[Dict[str, str]] = None) -> subprocess.Popen:
+    cmd = [sys.executable, '-m', 'uvicorn', 'api.index:app', '--host', '127.0.0.1',
+           '--port', str(port), '--workers', str(workers), '--log-level', 'warning']
+    return subprocess.Popen(cmd, cwd=ROOT_DIR, stdout=subprocess.DEVNULL,
+                            env={**os.environ, **env} if env else None)
+
+
+def wait_until_ready(base_url: str, timeout: float = 60) -> float:
+    """サーバーが応答するまで待ち、起動にかかった秒数を返す"""
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        try:
+            status, _ = http_request(base_url, 'GET', PROBE_PATH, timeout=2)
+            if status == 200:
+                return time.perf_counter() - start
+        except (urllib.error.URLError, ConnectionError, OSError):
+            pass
+        time.sleep(0.1)
+    raise RuntimeError(f"サーバーが {timeout} 秒以内に起動しませんでした: {base_url}")
+
+
+# --- 負荷試験本体 ---
+class LoadTest:
+    def __init__(self, base_url: str, store_json: Dict[str, List[Dict[str, Any]]], xlsx_bytes: bytes,
+                 mix: Dict[str, float], optimize_items: int, timeout: float):
+        self.base_url = base_url
+        self.positions = store_json['棚位置']
+        self.daiban_ids = sorted({p['台番号'] for p in self.positions})
+        self.xlsx_bytes = xlsx_bytes
+        self.endpoints = [name for name in ENDPOINTS if mix.get(name, 0) > 0]
+        self.weights = [mix[name] for name in self.endpoints]
+        self.optimize_items = optimize_items
+        self.timeout = timeout
+        self.latencies: Dict[str, List[float]] = {name: [] for name in ENDPOINTS}
+        self.errors: Dict[str, int] = {name: 0 for name in ENDPOINTS}
+        # 試験時間の終了後に完了したリクエスト数（--duration は新規リクエストの開始のみを止める）
+        self.overran: Dict[str, int] = {name: 0 for name in ENDPOINTS}
+        self.in_window = 0
+        self.deadline: Optional[float] = None
+        self.duration = 0.0
+        self.probe_latencies: List[float] = []
+        self.server_rss: List[float] = []
+        self.lock = threading.Lock()
+
+    def _optimize_payload(self) -> Dict[str, Any]:
+        # 最適化はO(n^2)のため、先頭の台から指定件数だけを送る
+        positions = self.positions[:self.optimize_items] if self.optimize_items > 0 else self.positions
+        return {'position': positions}
+
+    def call(self, name: str) -> None:
+        start = time.perf_counter()
+        try:
+            if name == 'upload':
+                body, content_type = _multipart_body(
+                    'file', 'load_test.xlsx', self.xlsx_bytes,
+                    'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
+                status, _ = http_request(self.base_url, 'POST', '/api/upload', body,
+                                         {'Content-Type': content_type}, self.timeout)
+            elif name == 'initial_data':
+                status, _ = http_request(self.base_url, 'GET', '/api/initial_data', timeout=self.timeout)
+            elif name == 'optimize':
+                body = json.dumps(self._optimize_payload()).encode('utf-8')
+                status, _ = http_request(self.base_url, 'POST', '/api/optimize', body,
+                                         {'Content-Type': 'application/json'}, self.timeout)
+            elif name == 'layout_data':
+                payload = {'position': self.positions, 'daiban_id': random.choice(self.daiban_ids)}
+                status, _ = http_request(self.base_url, 'POST', '/api/layout_data', json.dumps(payload).encode('utf-8'),
+                                         {'Content-Type': 'application/json'}, self.timeout)
+            else:
+                status, _ = http_request(self.base_url, 'GET', '/api/download_excel', timeout=self.timeout)
+            ok = status == 200
+        except Exception as e:
+            print(f"{name} リクエストエラー: {e}")
+            ok = False
+        finished = time.perf_counter()
+        elapsed = finished - start
+        with self.lock:
+            if self.deadline is not None:
+                if finished > self.deadline:
+                    self.overran[name] += 1
+                elif ok:
+                    self.in_window += 1
+            if ok:
+                self.latencies[name].append(elapsed)
+            else:
+                self.errors[name] += 1
+
+    def _worker(self, deadline: float, max_requests: Optional[int], counter: List[int]) -> None:
+        while time.perf_counter() < deadline:
+            with self.lock:
+                if max_requests is not None and counter[0] >= max_requests:
+                    return
+                counter[0] += 1
+            self.call(random.choices(self.endpoints, weights=self.weights)[0])
+
+    def _probe(self, stop: threading.Event, interval: float, server_pid: Optional[int]) -> None:
+        while not stop.is_set():
+            start = time.perf_counter()
+            try:
+                http_request(self.base_url, 'GET', PROBE_PATH, timeout=self.timeout)
+                self.probe_latencies.append(time.perf_counter() - start)
+            except Exception:
+                pass
+            if server_pid is not None:
+                rss = read_tree_rss_mb(server_pid)
+                if rss is not None:
+                    self.server_rss.append(rss)
+            stop.wait(interval)
+
+    def measure_idle_probe(self, samples: int = 20) -> List[float]:
+        idle = []
+        for _ in range(samples):
+            start = time.perf_counter()
+            http_request(self.base_url, 'GET', PROBE_PATH, timeout=self.timeout)
+            idle.append(time.perf_counter() - start)
+        return idle
+
+    def run(self, concurrency: int, duration: float, max_requests: Optional[int],
+            server_pid: Optional[int]) -> float:
+        # アップロード系以外のエンドポイントが動くよう、先に一度データを投入しておく
+        self.call('upload')
+        if self.errors['upload']:
+            raise RuntimeError("初期データのアップロードに失敗したため負荷試験を中止します。")
+        self.latencies['upload'].clear()
+
+        stop = threading.Event()
+        probe_thread = threading.Thread(target=self._probe, args=(stop, 0.1, server_pid), daemon=True)
+        probe_thread.start()
+
+        counter = [0]
+        start = time.perf_counter()
+        deadline = start + duration
+        self.deadline, self.duration = deadline, duration
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for _ in range(concurrency):
+                pool.submit(self._worker, deadline, max_requests, counter)
+        elapsed = time.perf_counter() - start
+
+        stop.set()
+        probe_thread.join()
+        return elapsed
+
+
+def _format_ms(seconds: float) -> str:
+    return f"{seconds * 1000:9.1f}"
+
+
+def report(test: LoadTest, elapsed: float, idle_probe: List[float], startup_sec: Optional[float]) -> Dict[str, Any]:
+    summary: Dict[str, Any] = {'duration_sec': test.duration, 'elapsed_sec': elapsed, 'endpoints': {}}
+    print()
+    print(f"{'endpoint':<16}{'count':>7}{'errors':>8}{'overran':>9}{'p50(ms)':>10}{'p99(ms)':>10}{'max(ms)':>10}{'req/s':>9}")
+    total = 0
+    for name in ENDPOINTS:
+        values = test.latencies[name]
+        if not values and not test.errors[name]:
+            continue
+        total += len(values)
+        stats = {
+            'count': len(values), 'errors': test.errors[name], 'overran': test.overran[name],
+            'p50_ms': percentile(values, 50) * 1000, 'p99_ms': percentile(values, 99) * 1000,
+            'max_ms': max(values, default=0) * 1000, 'rps': len(values) / elapsed if elapsed else 0
+        }
+        summary['endpoints'][name] = stats
+        print(f"{name:<16}{stats['count']:>7}{stats['errors']:>8}{stats['overran']:>9}{_format_ms(percentile(values, 50)):>10}"
+              f"{_format_ms(percentile(values, 99)):>10}{_format_ms(max(values, default=0)):>10}{stats['rps']:>9.2f}")
+    summary['throughput_rps'] = total / elapsed if elapsed else 0
+    summary['window_throughput_rps'] = test.in_window / test.duration if test.duration else 0
+    summary['overran'] = sum(test.overran.values())
+    print(f"\n試験時間: 設定 {test.duration:.1f} 秒 / 実測 {elapsed:.1f} 秒")
+    print(f"合計スループット: {summary['throughput_rps']:.2f} req/s（{total} 件 / 実測 {elapsed:.1f} 秒）")
+    print(f"設定時間内スループット: {summary['window_throughput_rps']:.2f} req/s"
+          f"（時間内に完了した {test.in_window} 件 / {test.duration:.1f} 秒）")
+    if summary['overran']:
+        print(f"⚠ {summary['overran']} 件のリクエストが試験時間の終了後に完了し、試験が {elapsed - test.duration:.1f} 秒延長されました。"
+              "サイジングには設定時間内スループットを使うか、--optimize-items などで1リクエストの負荷を下げてください。")
+
+    # イベントループのブロッキング検出：負荷中のプローブ遅延がアイドル時より大きく悪化していないか
+    idle_p50 = percentile(idle_probe, 50)
+    probe_p99 = percentile(test.probe_latencies, 99)
+    summary['probe'] = {
+        'idle_p50_ms': idle_p50 * 1000, 'load_p50_ms': percentile(test.probe_latencies, 50) * 1000,
+        'load_p99_ms': probe_p99 * 1000, 'load_max_ms': max(test.probe_latencies, default=0) * 1000
+    }
+    print(f"イベントループプローブ ({PROBE_PATH}): アイドル p50 {idle_p50 * 1000:.1f}ms / "
+          f"負荷時 p50 {summary['probe']['load_p50_ms']:.1f}ms, p99 {probe_p99 * 1000:.1f}ms, "
+          f"max {summary['probe']['load_max_ms']:.1f}ms")
+    if probe_p99 > max(idle_p50 * 20, 0.1):
+        print("⚠ 負荷時にプローブが大きく遅延しています。async エンドポイント内の同期処理がイベントループをブロックしている可能性があります。")
+
+    if startup_sec is not None:
+        summary['server_startup_sec'] = startup_sec
+        print(f"サーバー起動時間: {startup_sec:.2f} 秒")
+    if test.server_rss:
+        summary['server_rss_mb'] = {'final': test.server_rss[-1], 'peak': max(test.server_rss)}
+        print(f"サーバーRSS（全ワーカー合計）: 最終 {test.server_rss[-1]:.1f}MB / ピーク {max(test.server_rss):.1f}MB")
+    else:
+        print("⚠ サーバーのメモリは計測されていません（--url 指定時、またはLinux以外の環境）。")
+    summary['client_peak_rss_mb'] = client_peak_rss_mb()
+    print(f"クライアントピークRSS: {summary['client_peak_rss_mb']:.1f}MB")
+    return summary
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    mix = parse_attribute_mix(text)
+    unknown = set(mix) - set(ENDPOINTS)
+    if unknown:
+        raise argparse.ArgumentTypeError(f"不明なエンドポイント: {', '.join(sorted(unknown))}")
+    return mix
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description='HTTP APIの並行負荷試験')
+    parser.add_argument('--url', help='既存サーバーのURL（未指定時はuvicornを起動）')
+    parser.add_argument('--workers', type=int, default=1, help='起動するuvicornのワーカー数')
+    parser.add_argument('--concurrency', type=int, default=8, help='同時接続数')
+    parser.add_argument('--duration', type=float, default=30, help='試験時間（秒）')
+    parser.add_argument('--requests', type=int, help='総リクエスト数の上限')
+    parser.add_argument('--mix', type=parse_mix, default=DEFAULT_MIX,
+                        help='エンドポイントの重み 例: upload=1,initial_data=4,optimize=1,layout_data=4,download_excel=2')
+    parser.add_argument('--optimize-items', type=int, default=24,
+                        help='/api/optimize に送る棚位置の件数（0で全件）')
+    parser.add_argument('--timeout', type=float, default=600, help='リクエストのタイムアウト（秒）')
+    parser.add_argument('--dai', type=int, default=4, help='生成する台の数')
+    parser.add_argument('--tandan', type=int, default=3, help='台ごとの段数')
+    parser.add_argument('--faces', type=int, default=17, help='台のフェイス数')
+    parser.add_argument('--attributes', type=parse_attribute_mix, default={'お茶': 0.5, 'コーヒー': 0.5},
+                        help='属性比率 例: お茶=0.6,コーヒー=0.4')
+    parser.add_argument('--master-size', type=int, default=50, help='商品マスターの件数')
+    parser.add_argument('--seed', type=int, default=0, help='乱数シード')
+    parser.add_argument('--json', dest='json_out', help='結果をJSONで書き出すパス')
+    return parser
+
+
+def main():
+    args = build_arg_parser().parse_args()
+    random.seed(args.seed)
+
+    store = generate_store(num_dai=args.dai, num_tandan=args.tandan, faces=args.faces,
+                           attributes=args.attributes, master_size=args.master_size, seed=args.seed)
+    store_json = json.loads(json.dumps(to_json_dict(store), default=int))
+    xlsx_bytes = to_xlsx_bytes(store)
+    print(f"生成データ: 台 {len(store['台'])} / 棚位置 {len(store['棚位置'])} / 商品 {len(store['商品'])}")
+
+    server = None
+    startup_sec = None
+    base_url = args.url.rstrip('/') if args.url else None
+    try:
+        if base_url is None:
+            port = free_port()
+            base_url = f'http://127.0.0.1:{port}'
+            server = start_server(port, args.workers)
+            startup_sec = wait_until_ready(base_url)
+
+        test = LoadTest(base_url, store_json, xlsx_bytes, args.mix, args.optimize_items, args.timeout)
+        idle_probe = test.measure_idle_probe()
+        print(f"負荷試験開始: {base_url} 同時接続 {args.concurrency} / {args.duration} 秒")
+        elapsed = test.run(args.concurrency, args.duration, args.requests,
+                           server.pid if server is not None else None)
+        summary = report(test, elapsed, idle_probe, startup_sec)
+
+        if args.json_out:
+            with open(args.json_out, 'w', encoding='utf-8') as f:
+                json.dump(summary, f, ensure_ascii=False, indent=2)
+            print(f"結果を出力: {args.json_out}")
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=10)
+
+
+if __name__ == '__main__':
+    main()
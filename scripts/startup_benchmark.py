@@ -0,0 +1,125 @@
+"""
+起動時間ベンチマーク
+
+新しいPythonプロセスで次を計測し、回数分の中央値と最大値を報告する。
+  - import: api.index のインポート時間
+  - ready: uvicorn 起動から最初の応答（/openapi.json）まで
+  - first_request: uvicorn 起動から最初のデータ応答（/api/initial_data）まで
+  - dataset_load: 既定データの読み込み時間（サーバー側の計測値、pandasのインポートを除く）
+
+通常モードと高速起動モード（FAST_START=1）を比較し、しきい値を超えた場合は終了コード1を返すため、
+CIなどで起動時間の退行を検出できる。
+
+使用例:
+    python scripts/startup_benchmark.py --runs 5
+    python scripts/startup_benchmark.py --modes fast --max-first-request-ms 3000 --json startup.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+from load_test import ROOT_DIR, free_port, http_request, start_server, wait_until_ready
+
+MODES = {'normal': {'FAST_START': '0'}, 'fast': {'FAST_START': '1'}}
+
+IMPORT_SNIPPET = (
+    "import time; start = time.perf_counter(); import api.index; "
+    "print((time.perf_counter() - start) * 1000)"
+)
+
+
+def measure_import_ms(env: Dict[str, str]) -> float:
+    result = subprocess.run([sys.executable, '-c', IMPORT_SNIPPET], cwd=ROOT_DIR, env=env,
+                            capture_output=True, text=True, check=True)
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def measure_server(env: Dict[str, str]) -> Dict[str, float]:
+    port = free_port()
+    base_url = f'http://127.0.0.1:{port}'
+    start = time.perf_counter()
+    server = start_server(port, 1, env)
+    try:
+        wait_until_ready(base_url)
+        ready_ms = (time.perf_counter() - start) * 1000
+        status, _ = http_request(base_url, 'GET', '/api/initial_data')
+        if status != 200:
+            raise RuntimeError(f"/api/initial_data が {status} を返しました")
+        first_request_ms = (time.perf_counter() - start) * 1000
+        _, body = http_request(base_url, 'GET', '/api/startup_timing')
+        server_timing = json.loads(body)
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+    return {
+        'ready_ms': ready_ms,
+        'first_request_ms': first_request_ms,
+        'server_import_ms': server_timing.get('import_ms', 0.0),
+        'server_startup_ms': server_timing.get('startup_ms', 0.0),
+        'pandas_import_ms': server_timing.get('pandas_import_ms', 0.0),
+        'dataset_load_ms': server_timing.get('dataset_load_ms', 0.0),
+        'dataset_source': server_timing.get('dataset_source', ''),
+    }
+
+
+def run_mode(name: str, runs: int) -> Dict[str, Dict[str, float]]:
+    env = {**os.environ, **MODES[name]}
+    samples: Dict[str, List[float]] = {}
+    sources = set()
+    for _ in range(runs):
+        samples.setdefault('import_ms', []).append(measure_import_ms(env))
+        for key, value in measure_server(env).items():
+            if key == 'dataset_source':
+                sources.add(value)
+            else:
+                samples.setdefault(key, []).append(value)
+    summary = {key: {'median': statistics.median(values), 'max': max(values)} for key, values in samples.items()}
+    summary['dataset_source'] = ','.join(sorted(sources))
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description='APIの起動時間ベンチマーク')
+    parser.add_argument('--runs', type=int, default=3, help='モードごとの計測回数')
+    parser.add_argument('--modes', nargs='+', choices=list(MODES), default=list(MODES), help='計測するモード')
+    parser.add_argument('--max-import-ms', type=float, help='importの中央値の上限（超えたら失敗）')
+    parser.add_argument('--max-first-request-ms', type=float, help='first_requestの中央値の上限（超えたら失敗）')
+    parser.add_argument('--max-dataset-load-ms', type=float,
+                        help='dataset_load（pandasのインポートを除く）の中央値の上限（超えたら失敗）')
+    parser.add_argument('--json', dest='json_out', help='結果をJSONで書き出すパス')
+    args = parser.parse_args()
+
+    results = {}
+    failed = False
+    for mode in args.modes:
+        summary = run_mode(mode, args.runs)
+        results[mode] = summary
+        print(f"\n[{mode}] データ読み込み元: {summary['dataset_source'] or '-'}")
+        for key, stats in summary.items():
+            if key == 'dataset_source':
+                continue
+            print(f"  {key:<20} 中央値 {stats['median']:8.1f}ms  最大 {stats['max']:8.1f}ms")
+        if args.max_import_ms is not None and summary['import_ms']['median'] > args.max_import_ms:
+            print(f"  ✗ import が上限 {args.max_import_ms}ms を超えました")
+            failed = True
+        if args.max_first_request_ms is not None and summary['first_request_ms']['median'] > args.max_first_request_ms:
+            print(f"  ✗ first_request が上限 {args.max_first_request_ms}ms を超えました")
+            failed = True
+        if args.max_dataset_load_ms is not None and summary['dataset_load_ms']['median'] > args.max_dataset_load_ms:
+            print(f"  ✗ dataset_load が上限 {args.max_dataset_load_ms}ms を超えました")
+            failed = True
+
+    if args.json_out:
+        with open(args.json_out, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n結果を出力: {args.json_out}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()